@@ -1,14 +1,31 @@
 import json
 from pathlib import Path
-from typing import Literal, Self
-
-from pydantic import BaseModel, Field, SecretStr, ValidationError, field_serializer, model_validator
+from typing import Annotated, Literal, Self
+
+from pydantic import (
+    BaseModel,
+    Field,
+    SecretStr,
+    ValidationError,
+    field_serializer,
+    field_validator,
+    model_validator,
+)
 
 from kimi_cli.exception import ConfigError
 from kimi_cli.share import get_share_dir
 from kimi_cli.utils.logging import logger
 
 
+class RateLimit(BaseModel):
+    """Proactive rate limit configuration."""
+
+    requests_per_minute: int | None = Field(default=None, gt=0)
+    """Maximum number of requests per minute"""
+    tokens_per_minute: int | None = Field(default=None, gt=0)
+    """Maximum number of input tokens per minute"""
+
+
 class LLMProvider(BaseModel):
     """LLM provider configuration."""
 
@@ -20,6 +37,8 @@ class LLMProvider(BaseModel):
     """API key"""
     custom_headers: dict[str, str] | None = None
     """Custom headers to include in API requests"""
+    rate_limit: RateLimit | None = None
+    """Rate limit to proactively throttle the API requests"""
 
     @field_serializer("api_key", when_used="json")
     def dump_secret(self, v: SecretStr):
@@ -42,6 +61,10 @@ class LLMModel(BaseModel):
     """Model capabilities"""
 
 
+_DEFAULT_TOOL_RESULT_TRUNCATION: dict[str, int | None] = {"ReadFile": None}
+"""ReadFile is not truncated by default because it already pages its output."""
+
+
 class LoopControl(BaseModel):
     """Agent loop control configuration."""
 
@@ -49,6 +72,20 @@ class LoopControl(BaseModel):
     """Maximum number of steps in one run"""
     max_retries_per_step: int = 3
     """Maximum number of retries in one step"""
+    compaction_threshold: float = Field(default=0.9, gt=0, le=1)
+    """Ratio of the maximum context size at which the context will be compacted"""
+    max_tool_result_tokens: int = Field(default=8000, gt=0)
+    """Maximum estimated tokens of one tool result, above which it is truncated"""
+    tool_result_truncation: dict[str, Annotated[int, Field(gt=0)] | None] = Field(
+        default_factory=lambda: dict(_DEFAULT_TOOL_RESULT_TRUNCATION)
+    )
+    """Per-tool overrides of `max_tool_result_tokens`, keyed by tool name, `null` for no
+    truncation. Merged over the defaults, where ReadFile is not truncated"""
+
+    @field_validator("tool_result_truncation")
+    @classmethod
+    def merge_tool_result_truncation(cls, value: dict[str, int | None]) -> dict[str, int | None]:
+        return {**_DEFAULT_TOOL_RESULT_TRUNCATION, **value}
 
 
 class MoonshotSearchConfig(BaseModel):
@@ -6,12 +6,14 @@ from pydantic import SecretStr
 
 from kimi_cli.config import LLMModel, LLMModelCapability, LLMProvider
 from kimi_cli.constant import USER_AGENT
+from kimi_cli.utils.throttle import RateLimiter
 
 
 class LLM(NamedTuple):
     chat_provider: ChatProvider
     max_context_size: int
     capabilities: set[LLMModelCapability]
+    rate_limiter: RateLimiter | None = None
     # TODO: these additional fields should be moved to ChatProvider
 
     @property
@@ -118,8 +120,16 @@ def create_llm(
                 ),
             )
 
+    rate_limiter = None
+    if provider.rate_limit is not None:
+        rate_limiter = RateLimiter(
+            requests_per_minute=provider.rate_limit.requests_per_minute,
+            tokens_per_minute=provider.rate_limit.tokens_per_minute,
+        )
+
     return LLM(
         chat_provider=chat_provider,
         max_context_size=model.max_context_size,
         capabilities=model.capabilities or set(),
+        rate_limiter=rate_limiter,
     )
@@ -4,7 +4,7 @@ import string
 from pathlib import Path
 from typing import Any, NamedTuple
 
-from kosong.tooling import CallableTool, CallableTool2, Toolset
+from kosong.tooling import CallableTool, CallableTool2
 
 from kimi_cli.agentspec import ResolvedAgentSpec, load_agent_spec
 from kimi_cli.config import Config
@@ -21,7 +21,7 @@ class Agent(NamedTuple):
 
     name: str
     system_prompt: str
-    toolset: Toolset
+    toolset: CustomToolset
 
 
 async def load_agent(
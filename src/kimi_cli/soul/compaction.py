@@ -1,3 +1,4 @@
+import re
 from collections.abc import Sequence
 from string import Template
 from typing import TYPE_CHECKING, Protocol, runtime_checkable
@@ -7,9 +8,12 @@ from kosong.base.message import ContentPart, Message, TextPart
 
 import kimi_cli.prompts as prompts
 from kimi_cli.llm import LLM
-from kimi_cli.soul.message import system
+from kimi_cli.soul.message import is_checkpoint_message, system
 from kimi_cli.utils.logging import logger
 
+_COMPACT_TEMPLATE = Template(prompts.COMPACT)
+_COMPACTION_OUTPUT_HEADER = "Previous context has been compacted. Here is the compaction output:"
+
 
 @runtime_checkable
 class Compaction(Protocol):
@@ -32,6 +36,12 @@ class Compaction(Protocol):
 
 class SimpleCompaction(Compaction):
     MAX_PRESERVED_MESSAGES = 2
+    MAX_KNOWLEDGE_MESSAGES = 3
+    """
+    Previous compaction outputs at the head of the history are kept verbatim and only the
+    messages after them are compacted, so that the prefix stays stable for the prompt cache.
+    When there are this many of them, all of them are compacted again.
+    """
 
     async def compact(self, messages: Sequence[Message], llm: LLM) -> Sequence[Message]:
         history = list(messages)
@@ -53,9 +63,23 @@ class SimpleCompaction(Compaction):
         to_compact = history[:preserve_start_index]
         to_preserve = history[preserve_start_index:]
 
+        knowledge: list[Message] = []
+        n_leading = 0
+        for message in to_compact:
+            if _is_compaction_output(message):
+                knowledge.append(message)
+            elif not is_checkpoint_message(message):
+                break
+            # checkpoint messages are dropped, they will be added again after compaction
+            n_leading += 1
+        if len(knowledge) >= self.MAX_KNOWLEDGE_MESSAGES:
+            knowledge = []
+        else:
+            to_compact = to_compact[n_leading:]
+
         if not to_compact:
             # Let's hope this won't exceed the context size limit
-            return to_preserve
+            return [*knowledge, *to_preserve]
 
         # Convert history to string for the compact prompt
         history_text = "\n\n".join(
@@ -64,8 +88,7 @@ class SimpleCompaction(Compaction):
         )
 
         # Build the compact prompt using string template
-        compact_template = Template(prompts.COMPACT)
-        compact_prompt = compact_template.substitute(CONTEXT=history_text)
+        compact_prompt = _COMPACT_TEMPLATE.substitute(CONTEXT=history_text)
 
         # Create input message for compaction
         compact_message = Message(role="user", content=compact_prompt)
@@ -86,19 +109,91 @@ class SimpleCompaction(Compaction):
                 output=usage.output,
             )
 
-        content: list[ContentPart] = [
-            system("Previous context has been compacted. Here is the compaction output:")
-        ]
+        content: list[ContentPart] = [system(_COMPACTION_OUTPUT_HEADER)]
         content.extend(
             [TextPart(text=compacted_msg.content)]
             if isinstance(compacted_msg.content, str)
             else compacted_msg.content
         )
-        compacted_messages: list[Message] = [Message(role="assistant", content=content)]
+        compacted_messages: list[Message] = [*knowledge, Message(role="assistant", content=content)]
         compacted_messages.extend(to_preserve)
         return compacted_messages
 
 
+def _is_compaction_output(message: Message) -> bool:
+    return (
+        message.role == "assistant"
+        and not isinstance(message.content, str)
+        and bool(message.content)
+        and message.content[0] == system(_COMPACTION_OUTPUT_HEADER)
+    )
+
+
+_LOW_SIGNAL_LINE_RE = re.compile(
+    r"^\s*(?:"
+    r"[-=_.*#~|/\\>·•]*"  # blank lines, separators, progress dots, etc.
+    r"|\d{1,3}(?:\.\d+)?%\s*\|.*"  # progress bars like `42%|████      | 42/100`
+    r")\s*$"
+)
+
+
+class LinePruning:
+    """
+    Prune low-signal lines from old tool results, without calling the LLM.
+
+    Unlike LLM summarization, the lines that are kept stay verbatim, so exact paths,
+    error messages and line numbers survive the compaction.
+    """
+
+    MAX_PRESERVED_MESSAGES = 2
+    """Tool results after the last N user/assistant messages are not pruned."""
+
+    def prune(self, messages: Sequence[Message]) -> list[Message]:
+        history = list(messages)
+
+        prune_end_index = 0
+        n_preserved = 0
+        for index in range(len(history) - 1, -1, -1):
+            if history[index].role in {"user", "assistant"}:
+                n_preserved += 1
+                if n_preserved == self.MAX_PRESERVED_MESSAGES:
+                    prune_end_index = index
+                    break
+
+        for index in range(prune_end_index):
+            message = history[index]
+            if message.role != "tool" or isinstance(message.content, str):
+                continue
+            content: list[ContentPart] = []
+            changed = False
+            for part in message.content:
+                if isinstance(part, TextPart) and not part.text.startswith("<system>"):
+                    pruned_text = self._prune_text(part.text)
+                    if pruned_text != part.text:
+                        part = TextPart(text=pruned_text)
+                        changed = True
+                content.append(part)
+            if changed:
+                history[index] = message.model_copy(update={"content": content})
+        return history
+
+    @staticmethod
+    def _prune_text(text: str) -> str:
+        # keep the line endings, so that the kept lines stay verbatim
+        lines: list[str] = []
+        last_line: str | None = None
+        n_dropped = 0
+        for line in text.splitlines(keepends=True):
+            stripped = line.rstrip("\r\n")
+            if _LOW_SIGNAL_LINE_RE.match(stripped) or stripped == last_line:
+                # low-signal lines, or duplicated lines, e.g. repeated stack frames or log lines
+                n_dropped += 1
+                continue
+            lines.append(line)
+            last_line = stripped
+        return "".join(lines) if n_dropped else text
+
+
 if TYPE_CHECKING:
 
     def type_check(simple: SimpleCompaction):
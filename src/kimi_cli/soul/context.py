@@ -8,6 +8,7 @@ from kosong.base.message import Message
 
 from kimi_cli.soul.message import system
 from kimi_cli.utils.logging import logger
+from kimi_cli.utils.message import message_estimate_tokens
 from kimi_cli.utils.path import next_available_rotation
 
 
@@ -16,6 +17,8 @@ class Context:
         self._file_backend = file_backend
         self._history: list[Message] = []
         self._token_count: int = 0
+        self._pending_token_count: int = 0
+        """Estimated token count of the messages appended after the last usage update."""
         self._next_checkpoint_id: int = 0
         """The ID of the next checkpoint, starting from 0, incremented after each checkpoint."""
 
@@ -38,15 +41,21 @@ class Context:
                 line_json = json.loads(line)
                 if line_json["role"] == "_usage":
                     self._token_count = line_json["token_count"]
+                    self._pending_token_count = 0
                     continue
                 if line_json["role"] == "_checkpoint":
                     self._next_checkpoint_id = line_json["id"] + 1
                     continue
                 message = Message.model_validate(line_json)
                 self._history.append(message)
+                self._pending_token_count += message_estimate_tokens(message)
 
         return True
 
+    @property
+    def file_backend(self) -> Path:
+        return self._file_backend
+
     @property
     def history(self) -> Sequence[Message]:
         return self._history
@@ -55,6 +64,14 @@ class Context:
     def token_count(self) -> int:
         return self._token_count
 
+    @property
+    def estimated_token_count(self) -> int:
+        """
+        The token count reported by the LLM, plus a local estimation of the messages appended
+        after that, e.g. tool results which are not counted until the next LLM call returns.
+        """
+        return self._token_count + self._pending_token_count
+
     @property
     def n_checkpoints(self) -> int:
         return self._next_checkpoint_id
@@ -103,6 +120,7 @@ class Context:
         # restore the context until the specified checkpoint
         self._history.clear()
         self._token_count = 0
+        self._pending_token_count = 0
         self._next_checkpoint_id = 0
         async with (
             aiofiles.open(rotated_file_path, encoding="utf-8") as old_file,
@@ -119,24 +137,29 @@ class Context:
                 await new_file.write(line)
                 if line_json["role"] == "_usage":
                     self._token_count = line_json["token_count"]
+                    self._pending_token_count = 0
                 elif line_json["role"] == "_checkpoint":
                     self._next_checkpoint_id = line_json["id"] + 1
                 else:
                     message = Message.model_validate(line_json)
                     self._history.append(message)
+                    self._pending_token_count += message_estimate_tokens(message)
 
     async def append_message(self, message: Message | Sequence[Message]):
         logger.debug("Appending message(s) to context: {message}", message=message)
         messages = message if isinstance(message, Sequence) else [message]
         self._history.extend(messages)
+        self._pending_token_count += sum(message_estimate_tokens(m) for m in messages)
 
         async with aiofiles.open(self._file_backend, "a", encoding="utf-8") as f:
-            for message in messages:
-                await f.write(message.model_dump_json(exclude_none=True) + "\n")
+            await f.write(
+                "".join(message.model_dump_json(exclude_none=True) + "\n" for message in messages)
+            )
 
     async def update_token_count(self, token_count: int):
         logger.debug("Updating token count in context: {token_count}", token_count=token_count)
         self._token_count = token_count
+        self._pending_token_count = 0
 
         async with aiofiles.open(self._file_backend, "a", encoding="utf-8") as f:
             await f.write(json.dumps({"role": "_usage", "token_count": token_count}) + "\n")
@@ -1,19 +1,22 @@
 import asyncio
-from collections.abc import Sequence
+import re
+from collections.abc import Awaitable, Callable, Sequence
 from functools import partial
 from typing import TYPE_CHECKING
 
+import aiofiles
+import aiofiles.os
 import kosong
 import tenacity
 from kosong import StepResult
-from kosong.base.message import ContentPart, ImageURLPart, Message
+from kosong.base.message import ContentPart, ImageURLPart, Message, TextPart
 from kosong.chat_provider import (
     APIConnectionError,
     APIStatusError,
     APITimeoutError,
     ChatProviderError,
 )
-from kosong.tooling import ToolResult
+from kosong.tooling import ToolOk, ToolResult
 from tenacity import RetryCallState, retry_if_exception, stop_after_attempt, wait_exponential_jitter
 
 from kimi_cli.soul import (
@@ -25,13 +28,17 @@ from kimi_cli.soul import (
     wire_send,
 )
 from kimi_cli.soul.agent import Agent
-from kimi_cli.soul.compaction import SimpleCompaction
+from kimi_cli.soul.compaction import Compaction, LinePruning, SimpleCompaction
 from kimi_cli.soul.context import Context
-from kimi_cli.soul.message import system, tool_result_to_messages
+from kimi_cli.soul.message import is_checkpoint_message, system, tool_result_to_messages
 from kimi_cli.soul.runtime import Runtime
+from kimi_cli.soul.truncation import truncate_tool_message
+from kimi_cli.tools.compact import NAME as CompactContext_NAME
 from kimi_cli.tools.dmail import NAME as SendDMail_NAME
 from kimi_cli.tools.utils import ToolRejectedError
 from kimi_cli.utils.logging import logger
+from kimi_cli.utils.message import message_estimate_tokens
+from kimi_cli.utils.path import next_available_rotation
 from kimi_cli.wire.message import (
     CompactionBegin,
     CompactionEnd,
@@ -40,7 +47,24 @@ from kimi_cli.wire.message import (
     StepInterrupted,
 )
 
-RESERVED_TOKENS = 50_000
+CONTEXT_PRESSURE_RATIO = 0.8
+"""Context usage ratio above which the status is updated before every step."""
+PRUNING_TARGET_RATIO = 0.8
+"""Ratio of the compaction budget that the pruned context should be below to skip the LLM
+summarization. Pruning to just below the budget would compact again in the next step."""
+
+_RETRYABLE_ERRORS = (APIConnectionError, APITimeoutError)
+_RETRYABLE_STATUS_CODES = frozenset(
+    {
+        429,  # Too Many Requests
+        500,  # Internal Server Error
+        502,  # Bad Gateway
+        503,  # Service Unavailable
+    }
+)
+
+_DEFAULT_COMPACTION = SimpleCompaction()
+"""Compactions are stateless, so the default one is shared by all souls."""
 
 
 class KimiSoul(Soul):
@@ -52,6 +76,7 @@ class KimiSoul(Soul):
         runtime: Runtime,
         *,
         context: Context,
+        compaction: Compaction | None = None,
     ):
         """
         Initialize the soul.
@@ -60,6 +85,7 @@ class KimiSoul(Soul):
             agent (Agent): The agent to run.
             runtime (Runtime): Runtime parameters and states.
             context (Context): The context of the agent.
+            compaction (Compaction | None): The compaction to use. Defaults to `SimpleCompaction`.
         """
         self._agent = agent
         self._runtime = runtime
@@ -67,17 +93,11 @@ class KimiSoul(Soul):
         self._approval = runtime.approval
         self._context = context
         self._loop_control = runtime.config.loop_control
-        self._compaction = SimpleCompaction()  # TODO: maybe configurable and composable
-        self._reserved_tokens = RESERVED_TOKENS
-        if self._runtime.llm is not None:
-            assert self._reserved_tokens <= self._runtime.llm.max_context_size
+        self._pruning = LinePruning()
+        self._compaction = compaction or _DEFAULT_COMPACTION
+        self._compaction_requested = False
 
-        for tool in agent.toolset.tools:
-            if tool.name == SendDMail_NAME:
-                self._checkpoint_with_user_message = True
-                break
-        else:
-            self._checkpoint_with_user_message = False
+        self._checkpoint_with_user_message = SendDMail_NAME in agent.toolset.tool_names
 
     @property
     def name(self) -> str:
@@ -98,7 +118,7 @@ class KimiSoul(Soul):
     @property
     def _context_usage(self) -> float:
         if self._runtime.llm is not None:
-            return self._context.token_count / self._runtime.llm.max_context_size
+            return self._context.estimated_token_count / self._runtime.llm.max_context_size
         return 0.0
 
     async def _checkpoint(self):
@@ -129,6 +149,10 @@ class KimiSoul(Soul):
                 request = await self._approval.fetch_request()
                 wire_send(request)
 
+        compaction_budget = int(
+            self._runtime.llm.max_context_size * self._loop_control.compaction_threshold
+        )
+
         step_no = 1
         while True:
             wire_send(StepBegin(step_no))
@@ -138,15 +162,26 @@ class KimiSoul(Soul):
             # to the main wire. See `_SubWire` for more details. Later we need to figure
             # out a better solution.
             try:
-                # compact the context if needed
-                if (
-                    self._context.token_count + self._reserved_tokens
-                    >= self._runtime.llm.max_context_size
-                ):
-                    logger.info("Context too long, compacting...")
+                # compact the context if requested by the agent or needed
+                # tool results appended in the last step are not counted by the LLM yet,
+                # so use the estimated token count to compact before overflowing
+                if self._compaction_requested:
+                    self._compaction_requested = False
+                    logger.info("Compaction requested by the agent, compacting...")
                     wire_send(CompactionBegin())
                     await self.compact_context()
                     wire_send(CompactionEnd())
+                elif self._context.estimated_token_count >= compaction_budget:
+                    logger.info("Context too long, compacting...")
+                    wire_send(CompactionBegin())
+                    await self.compact_context(compaction_budget)
+                    wire_send(CompactionEnd())
+
+                # let the UI surface the context pressure before the LLM usage is known
+                # this must come after the compaction events, which the UI expects right
+                # after `StepBegin`
+                if self._context_usage >= CONTEXT_PRESSURE_RATIO:
+                    wire_send(StatusUpdate(status=self.status))
 
                 logger.debug("Beginning step {step_no}", step_no=step_no)
                 await self._checkpoint()
@@ -186,13 +221,17 @@ class KimiSoul(Soul):
         )
         async def _kosong_step_with_retry() -> StepResult:
             # run an LLM step (may be interrupted)
-            return await kosong.step(
-                chat_provider,
-                self._agent.system_prompt,
-                self._agent.toolset,
-                self._context.history,
-                on_message_part=wire_send,
-                on_tool_result=wire_send,
+            return await self._call_llm(
+                partial(
+                    kosong.step,
+                    chat_provider,
+                    self._agent.system_prompt,
+                    self._agent.toolset,
+                    self._context.history,
+                    on_message_part=wire_send,
+                    on_tool_result=wire_send,
+                ),
+                self._context.estimated_token_count,
             )
 
         result = await _kosong_step_with_retry()
@@ -207,9 +246,7 @@ class KimiSoul(Soul):
         logger.debug("Got tool results: {results}", results=results)
 
         # shield the context manipulation from interruption
-        await asyncio.shield(self._grow_context(result, results))
-
-        rejected = any(isinstance(result.result, ToolRejectedError) for result in results)
+        rejected = await asyncio.shield(self._grow_context(result, results))
         if rejected:
             _ = self._denwa_renji.fetch_pending_dmail()
             return True
@@ -240,27 +277,134 @@ class KimiSoul(Soul):
                 ],
             )
 
+        # the compaction requested by this soul is done before its next step
+        compaction_call_ids = {
+            tool_call.id
+            for tool_call in result.tool_calls
+            if tool_call.function.name == CompactContext_NAME
+        }
+        self._compaction_requested = any(
+            tool_result.tool_call_id in compaction_call_ids
+            and isinstance(tool_result.result, ToolOk)
+            for tool_result in results
+        )
+
         return not result.tool_calls
 
-    async def _grow_context(self, result: StepResult, tool_results: list[ToolResult]):
+    async def _grow_context(self, result: StepResult, tool_results: list[ToolResult]) -> bool:
+        """Grow the context with the step result and return whether any tool call is rejected."""
         logger.debug("Growing context with result: {result}", result=result)
         await self._context.append_message(result.message)
         if result.usage is not None:
             await self._context.update_token_count(result.usage.total)
 
         # token count of tool results are not available yet
+        tool_names = {tool_call.id: tool_call.function.name for tool_call in result.tool_calls}
+        tool_messages: list[Message] = []
+        rejected = False
         for tool_result in tool_results:
             logger.debug("Appending tool result to context: {tool_result}", tool_result=tool_result)
-            await self._context.append_message(tool_result_to_messages(tool_result))
+            messages = tool_result_to_messages(tool_result)
+            messages[0] = await self._truncate_tool_message(
+                messages[0], tool_names.get(tool_result.tool_call_id, "")
+            )
+            tool_messages.extend(messages)
+            rejected = rejected or isinstance(tool_result.result, ToolRejectedError)
+        if tool_messages:
+            await self._context.append_message(tool_messages)
+        return rejected
+
+    async def _truncate_tool_message(self, message: Message, tool_name: str) -> Message:
+        """
+        Truncate a too long tool message before it enters the context. The full output is saved
+        next to the context file, so that it can be read again if needed.
+        """
+        max_tokens = self._loop_control.tool_result_truncation.get(
+            tool_name, self._loop_control.max_tool_result_tokens
+        )
+        if max_tokens is None:
+            return message
+        try:
+            truncated = truncate_tool_message(message, max_tokens)
+        except Exception:
+            # a failed truncation should never lose the tool result
+            logger.exception(
+                "Failed to truncate the result of tool {tool_name}:", tool_name=tool_name
+            )
+            return message
+        if truncated is message:
+            return message
+
+        assert message.tool_call_id is not None, "Tool messages should have a tool call ID"
+        # each soul saves next to its own context file, and tool call IDs may repeat, so always
+        # take the next available name to not overwrite an output referred to by the history
+        context_file = self._context.file_backend
+        output_dir = context_file.parent / f"{context_file.stem}_tool_results"
+        assert isinstance(message.content, list)
+        try:
+            await aiofiles.os.makedirs(output_dir, exist_ok=True)
+            output_file = await next_available_rotation(
+                output_dir / f"{re.sub(r'[^\w-]', '_', message.tool_call_id)}.txt"
+            )
+            assert output_file is not None, "The output directory is just created"
+            async with aiofiles.open(output_file, "w", encoding="utf-8") as f:
+                await f.write(
+                    "\n".join(part.text for part in message.content if isinstance(part, TextPart))
+                )
+        except OSError:
+            # without the saved output, the truncated part would be lost for good
+            logger.exception("Failed to save the result of tool {tool_name}:", tool_name=tool_name)
+            return message
+        logger.info(
+            "Truncated the result of tool {tool_name}, full output saved to {file}",
+            tool_name=tool_name,
+            file=output_file,
+        )
 
-    async def compact_context(self) -> None:
+        assert isinstance(truncated.content, list)
+        truncated.content.append(
+            system(
+                "Tool output is too long and truncated. "
+                f"The full output is saved to `{output_file}`. If necessary, read it page by "
+                "page with ReadFile's `line_offset` and `n_lines`, instead of all at once."
+            )
+        )
+        return truncated
+
+    async def compact_context(self, budget: int | None = None) -> None:
         """
         Compact the context.
 
+        Low-signal lines of old tool results are pruned verbatim first. If `budget` is given
+        and the pruned context is clearly below it (see `PRUNING_TARGET_RATIO`), the LLM
+        summarization is skipped.
+
+        Args:
+            budget (int | None): The token count at which the context is compacted.
+
         Raises:
             LLMNotSet: When the LLM is not set.
             ChatProviderError: When the chat provider returns an error.
         """
+        history = self._context.history
+        pruned_messages = self._pruning.prune(history)
+        if budget is not None:
+            n_pruned_tokens = sum(
+                message_estimate_tokens(original) - message_estimate_tokens(pruned)
+                for original, pruned in zip(history, pruned_messages, strict=True)
+                if original is not pruned
+            )
+            if (
+                n_pruned_tokens > 0
+                and self._context.estimated_token_count - n_pruned_tokens
+                < budget * PRUNING_TARGET_RATIO
+            ):
+                logger.info(
+                    "Pruned {n} tokens from the context, skipping LLM compaction",
+                    n=n_pruned_tokens,
+                )
+                await self._rewrite_context(pruned_messages)
+                return
 
         @tenacity.retry(
             retry=retry_if_exception(self._is_retryable_error),
@@ -272,22 +416,44 @@ class KimiSoul(Soul):
         async def _compact_with_retry() -> Sequence[Message]:
             if self._runtime.llm is None:
                 raise LLMNotSet()
-            return await self._compaction.compact(self._context.history, self._runtime.llm)
+            return await self._call_llm(
+                partial(self._compaction.compact, pruned_messages, self._runtime.llm),
+                self._context.estimated_token_count,
+            )
 
         compacted_messages = await _compact_with_retry()
+        await self._rewrite_context(compacted_messages)
+
+    async def _rewrite_context(self, messages: Sequence[Message]) -> None:
         await self._context.revert_to(0)
         await self._checkpoint()
-        await self._context.append_message(compacted_messages)
+        # all checkpoints but the new one are gone, so are their IDs shown to the model
+        await self._context.append_message(
+            [message for message in messages if not is_checkpoint_message(message)]
+        )
+
+    async def _call_llm[T](self, call: Callable[[], Awaitable[T]], n_tokens: int) -> T:
+        """Call the LLM, proactively throttled by the rate limiter of the LLM if any."""
+        assert self._runtime.llm is not None
+        rate_limiter = self._runtime.llm.rate_limiter
+        if rate_limiter is None:
+            return await call()
+
+        await rate_limiter.acquire(n_tokens)
+        try:
+            result = await call()
+        except APIStatusError as e:
+            if e.status_code == 429:
+                rate_limiter.on_rate_limited()
+            raise
+        rate_limiter.on_success()
+        return result
 
     @staticmethod
     def _is_retryable_error(exception: BaseException) -> bool:
-        if isinstance(exception, (APIConnectionError, APITimeoutError)):
-            return True
-        return isinstance(exception, APIStatusError) and exception.status_code in (
-            429,  # Too Many Requests
-            500,  # Internal Server Error
-            502,  # Bad Gateway
-            503,  # Service Unavailable
+        return isinstance(exception, _RETRYABLE_ERRORS) or (
+            isinstance(exception, APIStatusError)
+            and exception.status_code in _RETRYABLE_STATUS_CODES
         )
 
     @staticmethod
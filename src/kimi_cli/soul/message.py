@@ -7,6 +7,17 @@ def system(message: str) -> ContentPart:
     return TextPart(text=f"<system>{message}</system>")
 
 
+def is_checkpoint_message(message: Message) -> bool:
+    """Check if a message is the user message added by `Context.checkpoint`."""
+    return (
+        message.role == "user"
+        and not isinstance(message.content, str)
+        and len(message.content) == 1
+        and isinstance(part := message.content[0], TextPart)
+        and part.text.startswith("<system>CHECKPOINT ")
+    )
+
+
 def tool_result_to_messages(tool_result: ToolResult) -> list[Message]:
     """Convert a tool result to a list of messages."""
     if isinstance(tool_result.result, ToolError):
@@ -1,4 +1,5 @@
-from contextvars import ContextVar
+from collections.abc import KeysView
+from contextvars import ContextVar, copy_context
 from typing import override
 
 from kosong.base.message import ToolCall
@@ -16,10 +17,15 @@ def get_current_tool_call_or_none() -> ToolCall | None:
 
 
 class CustomToolset(SimpleToolset):
+    @property
+    def tool_names(self) -> KeysView[str]:
+        """The names of the tools in the toolset, as a live view with O(1) membership tests."""
+        return self._tool_dict.keys()
+
     @override
     def handle(self, tool_call: ToolCall) -> HandleResult:
-        token = current_tool_call.set(tool_call)
-        try:
-            return super().handle(tool_call)
-        finally:
-            current_tool_call.reset(token)
+        # run in a copied context so that the tool call task created by `super().handle`
+        # inherits the current tool call, while the caller's context stays untouched
+        ctx = copy_context()
+        ctx.run(current_tool_call.set, tool_call)
+        return ctx.run(super().handle, tool_call)
@@ -0,0 +1,147 @@
+import json
+import re
+from typing import Any, TypeGuard, cast
+
+from kosong.base.message import ContentPart, Message, TextPart
+
+from kimi_cli.utils.message import estimate_text_tokens
+
+_JSON_MAX_ARRAY_ITEMS = 20
+"""JSON arrays longer than this are collapsed to their first items."""
+_HEAD_RATIO = 0.4
+_TAIL_RATIO = 0.4
+"""Ratios of the token budget kept for the head and the tail lines. The rest of the budget
+is for the important lines (e.g. errors) in the truncated middle."""
+
+_LINE_TRUNCATION_MARKER = "..."
+
+_IMPORTANT_LINE_RE = re.compile(
+    r"error|exception|traceback|fail|fatal|panic|warning|assert", re.IGNORECASE
+)
+
+
+def truncate_text(text: str, max_tokens: int) -> str:
+    """
+    Structurally truncate a text to roughly `max_tokens` estimated tokens.
+
+    - JSON texts get their long arrays collapsed first.
+    - Otherwise, or if still too long, the head and the tail lines are kept, together with the
+      lines in the middle that look like errors or warnings.
+
+    The text is returned as is if it is not too long.
+    """
+    if estimate_text_tokens(text) <= max_tokens:
+        return text
+
+    if (collapsed := _collapse_json(text)) is not None:
+        if estimate_text_tokens(collapsed) <= max_tokens:
+            return collapsed
+        text = collapsed
+
+    return _truncate_lines(text, max_tokens)
+
+
+def _collapse_json(text: str) -> str | None:
+    stripped = text.strip()
+    if not stripped.startswith(("{", "[")):
+        return None
+    try:
+        value = json.loads(stripped)
+        return json.dumps(_collapse_json_value(value), ensure_ascii=False, indent=2)
+    except (ValueError, RecursionError):
+        # not a JSON, or too deeply nested to collapse; fall back to the line truncation
+        return None
+
+
+def _collapse_json_value(value: Any) -> Any:
+    if isinstance(value, list):
+        value = cast(list[Any], value)
+        items = [_collapse_json_value(item) for item in value[:_JSON_MAX_ARRAY_ITEMS]]
+        if len(value) > _JSON_MAX_ARRAY_ITEMS:
+            items.append(f"[...elided {len(value) - _JSON_MAX_ARRAY_ITEMS} items...]")
+        return items
+    if isinstance(value, dict):
+        value = cast(dict[str, Any], value)
+        return {key: _collapse_json_value(item) for key, item in value.items()}
+    return value
+
+
+def _truncate_lines(text: str, max_tokens: int) -> str:
+    head_budget = int(max_tokens * _HEAD_RATIO)
+    # a single line (plus its line break) should never take more than the head budget
+    lines = [_truncate_line_tokens(line, head_budget - 1) for line in text.splitlines()]
+    n_tokens = [estimate_text_tokens(line) + 1 for line in lines]
+
+    # always keep the first line, even if the budget is too small for it
+    head_end = max(_take_within(n_tokens, head_budget), min(len(lines), 1))
+    n_tail = _take_within(n_tokens[head_end:][::-1], int(max_tokens * _TAIL_RATIO))
+    tail_start = len(lines) - n_tail
+    if tail_start <= head_end:
+        return "\n".join(lines)
+
+    budget = max_tokens - sum(n_tokens[:head_end]) - sum(n_tokens[tail_start:])
+    important: list[str] = []
+    for index in range(head_end, tail_start):
+        if not _IMPORTANT_LINE_RE.search(lines[index]):
+            continue
+        if n_tokens[index] > budget:
+            break
+        important.append(lines[index])
+        budget -= n_tokens[index]
+
+    n_truncated = tail_start - head_end - len(important)
+    marker = f"[...{n_truncated} lines truncated...]"
+    if important:
+        marker = f"[...{n_truncated} lines truncated, error/warning lines among them are kept...]"
+    return "\n".join([*lines[:head_end], marker, *important, *lines[tail_start:]])
+
+
+def _truncate_line_tokens(line: str, max_tokens: int) -> str:
+    """Truncate a line to roughly `max_tokens` estimated tokens, keeping its beginning."""
+    if estimate_text_tokens(line) <= max_tokens:
+        return line
+    # keep one token of slack for the rounding in `estimate_text_tokens`
+    budget = max_tokens - estimate_text_tokens(_LINE_TRUNCATION_MARKER) - 1
+    cost = 0.0
+    for index, char in enumerate(line):
+        cost += 0.25 if char.isascii() else 1
+        if cost > budget:
+            return line[:index] + _LINE_TRUNCATION_MARKER
+    return line
+
+
+def _take_within(n_tokens: list[int], budget: int) -> int:
+    """Return how many leading items fit in the budget."""
+    n_taken = 0
+    for n in n_tokens:
+        if n > budget:
+            break
+        budget -= n
+        n_taken += 1
+    return n_taken
+
+
+def truncate_tool_message(message: Message, max_tokens: int) -> Message:
+    """
+    Truncate the output text parts of a tool message to `max_tokens` estimated tokens in total.
+    The `<system>` parts are kept as is. The message itself is returned if nothing is truncated.
+    """
+    parts = (
+        [TextPart(text=message.content)] if isinstance(message.content, str) else message.content
+    )
+    n_tokens = sum(estimate_text_tokens(part.text) for part in parts if _is_output_part(part))
+    if n_tokens <= max_tokens:
+        return message
+
+    content: list[ContentPart] = []
+    for part in parts:
+        if _is_output_part(part):
+            # share the budget among the output parts by their sizes
+            part_budget = max_tokens * estimate_text_tokens(part.text) // n_tokens
+            part = TextPart(text=truncate_text(part.text, part_budget))
+        content.append(part)
+    return message.model_copy(update={"content": content})
+
+
+def _is_output_part(part: ContentPart) -> TypeGuard[TextPart]:
+    return isinstance(part, TextPart) and not part.text.startswith("<system>")
@@ -26,6 +26,10 @@ def extract_subtitle(lexer: streamingjson.Lexer, tool_name: str) -> str | None:
             if not isinstance(curr_args, dict) or not curr_args.get("thought"):
                 return None
             subtitle = str(curr_args["thought"])
+        case "CompactContext":
+            if not isinstance(curr_args, dict) or not curr_args.get("reason"):
+                return None
+            subtitle = str(curr_args["reason"])
         case "SetTodoList":
             if not isinstance(curr_args, dict) or not curr_args.get("todos"):
                 return None
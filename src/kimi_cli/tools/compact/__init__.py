@@ -0,0 +1,33 @@
+from pathlib import Path
+from typing import override
+
+from kosong.tooling import CallableTool2, ToolOk, ToolReturnType
+from pydantic import BaseModel, Field
+
+from kimi_cli.tools.utils import load_desc
+
+NAME = "CompactContext"
+
+
+class Params(BaseModel):
+    reason: str = Field(
+        description=(
+            "Why the context should be compacted now, and what has been concluded so far "
+            "that must be kept."
+        )
+    )
+
+
+class CompactContext(CallableTool2[Params]):
+    name: str = NAME
+    description: str = load_desc(Path(__file__).parent / "compact_context.md", {})
+    params: type[Params] = Params
+
+    @override
+    async def __call__(self, params: Params) -> ToolReturnType:
+        # the soul that made this call compacts its own context before its next step
+        return ToolOk(
+            output="",
+            message="The context will be compacted before your next step.",
+            brief="Compaction requested",
+        )
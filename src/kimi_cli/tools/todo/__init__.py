@@ -21,7 +21,5 @@ class SetTodoList(CallableTool2[Params]):
 
     @override
     async def __call__(self, params: Params) -> ToolReturnType:
-        rendered = ""
-        for todo in params.todos:
-            rendered += f"- {todo.title} [{todo.status}]\n"
+        rendered = "".join(f"- {todo.title} [{todo.status}]\n" for todo in params.todos)
         return ToolOk(output=rendered)
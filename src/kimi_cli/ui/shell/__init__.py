@@ -1,4 +1,6 @@
 import asyncio
+import shlex
+import shutil
 from collections.abc import Awaitable, Coroutine
 from dataclasses import dataclass
 from enum import Enum
@@ -105,7 +107,11 @@ class ShellApp:
         try:
             # TODO: For the sake of simplicity, we now use `create_subprocess_shell`.
             # Later we should consider making this behave like a real shell.
-            proc = await asyncio.create_subprocess_shell(command)
+            if argv := _split_simple_command(command):
+                # no shell features used, skip the extra shell process
+                proc = await asyncio.create_subprocess_exec(*argv)
+            else:
+                proc = await asyncio.create_subprocess_shell(command)
             await proc.wait()
         except Exception as e:
             logger.exception("Failed to run shell command:")
@@ -116,13 +122,16 @@ class ShellApp:
     async def _run_meta_command(self, command_str: str):
         from kimi_cli.cli import Reload
 
-        parts = command_str.split(" ")
-        command_name = parts[0]
-        command_args = parts[1:]
+        command_name, _, rest = command_str.partition(" ")
         command = get_meta_command(command_name)
         if command is None:
             console.print(f"Meta command /{command_name} not found")
             return
+        try:
+            command_args = shlex.split(rest)
+        except ValueError as e:
+            console.print(f"[red]Invalid arguments for /{command_name}: {e}[/red]")
+            return
         if command.kimi_soul_only and not isinstance(self.soul, KimiSoul):
             console.print(f"Meta command /{command_name} not supported")
             return
@@ -264,6 +273,25 @@ class WelcomeInfoItem:
     level: Level = Level.INFO
 
 
+_SHELL_SPECIAL_CHARS = frozenset("|&;<>()$`\\*?[]{}~!#=%\n")
+
+
+def _split_simple_command(command: str) -> list[str] | None:
+    """
+    Split a command into argv if it can be executed without a shell, i.e. it uses no shell
+    syntax and its program is an executable rather than a shell builtin. Otherwise, return None.
+    """
+    if _SHELL_SPECIAL_CHARS.intersection(command):
+        return None
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return None
+    if not argv or shutil.which(argv[0]) is None:
+        return None
+    return argv
+
+
 def _print_welcome_info(name: str, info_items: list[WelcomeInfoItem]) -> None:
     head = Text.from_markup(f"[bold]Welcome to {name}![/bold]")
     help_text = Text.from_markup("[grey50]Send /help for help information.[/grey50]")
@@ -281,10 +309,13 @@ def _print_welcome_info(name: str, info_items: list[WelcomeInfoItem]) -> None:
     for item in info_items:
         rows.append(Text(f"{item.name}: {item.value}", style=item.level.value))
 
-    if LATEST_VERSION_FILE.exists():
+    try:
+        latest_version = LATEST_VERSION_FILE.read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        latest_version = None
+    if latest_version is not None:
         from kimi_cli.constant import VERSION as current_version
 
-        latest_version = LATEST_VERSION_FILE.read_text(encoding="utf-8").strip()
         if semver_tuple(latest_version) > semver_tuple(current_version):
             rows.append(
                 Text.from_markup(
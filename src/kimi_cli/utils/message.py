@@ -1,4 +1,4 @@
-from kosong.base.message import Message, TextPart
+from kosong.base.message import Message, TextPart, ThinkPart
 
 
 def message_extract_text(message: Message) -> str:
@@ -20,3 +20,40 @@ def message_stringify(message: Message) -> str:
             else:
                 parts.append(f"[{part.type}]")
     return "".join(parts)
+
+
+_NON_TEXT_PART_TOKENS = 1_000
+"""Rough token cost of a non-text part (e.g. an image), which can not be estimated from text."""
+_MESSAGE_OVERHEAD_TOKENS = 4
+"""Rough token cost of the message envelope (role, separators, etc.)."""
+
+
+def estimate_text_tokens(text: str) -> int:
+    """
+    Roughly estimate the number of tokens of a text without a tokenizer.
+
+    ASCII characters are counted as ~4 characters per token, while non-ASCII characters
+    (mostly CJK, 3 bytes in UTF-8) are counted as ~1 token per character.
+    """
+    n_chars = len(text)
+    n_non_ascii = (len(text.encode("utf-8", errors="ignore")) - n_chars) // 2
+    return (n_chars - n_non_ascii + 3) // 4 + n_non_ascii
+
+
+def message_estimate_tokens(message: Message) -> int:
+    """Roughly estimate the number of tokens of a message without a tokenizer."""
+    n_tokens = _MESSAGE_OVERHEAD_TOKENS
+    if isinstance(message.content, str):
+        n_tokens += estimate_text_tokens(message.content)
+    else:
+        for part in message.content:
+            if isinstance(part, TextPart):
+                n_tokens += estimate_text_tokens(part.text)
+            elif isinstance(part, ThinkPart):
+                n_tokens += estimate_text_tokens(part.think)
+            else:
+                n_tokens += _NON_TEXT_PART_TOKENS
+    for tool_call in message.tool_calls or []:
+        n_tokens += estimate_text_tokens(tool_call.function.name)
+        n_tokens += estimate_text_tokens(tool_call.function.arguments or "")
+    return n_tokens
@@ -0,0 +1,89 @@
+import asyncio
+import time
+
+_SECONDS_PER_MINUTE = 60.0
+_MIN_RATE_FACTOR = 0.125
+_RATE_FACTOR_INCREMENT = 0.125
+
+
+class RateLimiter:
+    """
+    A proactive rate limiter with a request bucket and a token bucket.
+
+    Both buckets start full and are refilled continuously at the configured per-minute
+    rates. When a rate limit error is still hit, the buckets are drained and the refill rate
+    is halved, and then recovered step by step on successful requests (AIMD).
+    """
+
+    def __init__(
+        self,
+        *,
+        requests_per_minute: int | None = None,
+        tokens_per_minute: int | None = None,
+    ):
+        self._requests_per_minute = requests_per_minute
+        self._tokens_per_minute = tokens_per_minute
+        self._available_requests = float(requests_per_minute or 0)
+        self._available_tokens = float(tokens_per_minute or 0)
+        self._rate_factor = 1.0
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, n_tokens: int = 0) -> None:
+        """
+        Wait until one request with `n_tokens` tokens is allowed, then consume it.
+        A request larger than the token bucket only waits for the bucket to be full.
+        """
+        async with self._lock:  # the lock makes the waiters served in FIFO order
+            while (wait := self._time_until_available(n_tokens)) > 0:
+                await asyncio.sleep(wait)
+            if self._requests_per_minute is not None:
+                self._available_requests -= 1
+            if self._tokens_per_minute is not None:
+                self._available_tokens -= min(n_tokens, self._tokens_per_minute)
+
+    def on_success(self) -> None:
+        """Additively recover the refill rate. Intended to be called after a successful request."""
+        self._refill()
+        self._rate_factor = min(1.0, self._rate_factor + _RATE_FACTOR_INCREMENT)
+
+    def on_rate_limited(self) -> None:
+        """
+        Drain the buckets and multiplicatively decrease the refill rate. Intended to be called
+        on a 429 error, which means the buckets are not actually available on the server side.
+        """
+        self._refill()
+        self._available_requests = 0.0
+        self._available_tokens = 0.0
+        self._rate_factor = max(_MIN_RATE_FACTOR, self._rate_factor / 2)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed_minutes = (now - self._last_refill) / _SECONDS_PER_MINUTE * self._rate_factor
+        self._last_refill = now
+        if self._requests_per_minute is not None:
+            self._available_requests = min(
+                float(self._requests_per_minute),
+                self._available_requests + elapsed_minutes * self._requests_per_minute,
+            )
+        if self._tokens_per_minute is not None:
+            self._available_tokens = min(
+                float(self._tokens_per_minute),
+                self._available_tokens + elapsed_minutes * self._tokens_per_minute,
+            )
+
+    def _time_until_available(self, n_tokens: int) -> float:
+        """Refill the buckets and return the seconds to wait before the request is allowed."""
+        self._refill()
+        wait_minutes = 0.0
+        if self._requests_per_minute is not None and self._available_requests < 1:
+            wait_minutes = max(
+                wait_minutes, (1 - self._available_requests) / self._requests_per_minute
+            )
+        if self._tokens_per_minute is not None:
+            n_tokens = min(n_tokens, self._tokens_per_minute)
+            if self._available_tokens < n_tokens:
+                wait_minutes = max(
+                    wait_minutes, (n_tokens - self._available_tokens) / self._tokens_per_minute
+                )
+        return wait_minutes / self._rate_factor * _SECONDS_PER_MINUTE
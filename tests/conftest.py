@@ -16,6 +16,7 @@ from kimi_cli.soul.approval import Approval
 from kimi_cli.soul.denwarenji import DenwaRenji
 from kimi_cli.soul.runtime import BuiltinSystemPromptArgs, Runtime
 from kimi_cli.tools.bash import Bash
+from kimi_cli.tools.compact import CompactContext
 from kimi_cli.tools.dmail import SendDMail
 from kimi_cli.tools.file.glob import Glob
 from kimi_cli.tools.file.grep import Grep
@@ -147,6 +148,12 @@ def send_dmail_tool(denwa_renji: DenwaRenji) -> SendDMail:
     return SendDMail(denwa_renji)
 
 
+@pytest.fixture
+def compact_context_tool() -> CompactContext:
+    """Create a CompactContext tool instance."""
+    return CompactContext()
+
+
 @pytest.fixture
 def think_tool() -> Think:
     """Create a Think tool instance."""
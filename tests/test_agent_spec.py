@@ -83,6 +83,7 @@ agent:
                 "kimi_cli.tools.task:Task",
                 "kimi_cli.tools.think:Think",
                 "kimi_cli.tools.todo:SetTodoList",
+                "kimi_cli.tools.compact:CompactContext",
                 "kimi_cli.tools.bash:Bash",
                 "kimi_cli.tools.file:ReadFile",
                 "kimi_cli.tools.file:Glob",
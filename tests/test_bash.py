@@ -195,8 +195,7 @@ async def test_output_truncation_on_failure(bash_tool: Bash):
     assert "Command failed with exit code:" in result.message
 
 
-@pytest.mark.asyncio
-async def test_timeout_parameter_validation_bounds(bash_tool: Bash):
+def test_timeout_parameter_validation_bounds():
     """Test timeout parameter validation (bounds checking)."""
     # Test timeout < 1 (should fail validation)
     with pytest.raises(ValueError, match="timeout"):
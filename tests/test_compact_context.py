@@ -0,0 +1,96 @@
+"""Tests for the agent-requested context compaction."""
+
+import asyncio
+from collections.abc import Sequence
+from pathlib import Path
+
+import pytest
+from kosong.base.chat_provider import StreamedMessagePart
+from kosong.base.message import Message, TextPart, ToolCall
+from kosong.base.tool import Tool
+from kosong.chat_provider.mock import MockChatProvider, MockStreamedMessage
+
+from kimi_cli.llm import LLM
+from kimi_cli.soul import run_soul
+from kimi_cli.soul.agent import Agent
+from kimi_cli.soul.context import Context
+from kimi_cli.soul.kimisoul import KimiSoul
+from kimi_cli.soul.runtime import Runtime
+from kimi_cli.soul.toolset import CustomToolset
+from kimi_cli.tools.compact import CompactContext
+from kimi_cli.wire import WireUISide
+
+
+class ScriptedChatProvider(MockChatProvider):
+    """A mock chat provider that returns the given responses in order."""
+
+    def __init__(self, responses: list[list[StreamedMessagePart]]):
+        super().__init__([])
+        self._responses = responses
+        self.histories: list[list[Message]] = []
+
+    async def generate(
+        self,
+        system_prompt: str,
+        tools: Sequence[Tool],
+        history: Sequence[Message],
+    ) -> MockStreamedMessage:
+        self.histories.append(list(history))
+        return MockStreamedMessage(self._responses.pop(0))
+
+
+async def _drain_wire(wire: WireUISide) -> None:
+    while True:
+        await wire.receive()
+
+
+@pytest.mark.asyncio
+async def test_compact_context_compacts_before_next_step(runtime: Runtime, temp_work_dir: Path):
+    """Test that a CompactContext call compacts the context of the calling soul only."""
+    chat_provider = ScriptedChatProvider(
+        [
+            [
+                TextPart(text="Exploration done"),
+                ToolCall(
+                    id="call_1",
+                    function=ToolCall.FunctionBody(
+                        name="CompactContext", arguments='{"reason": "exploration finished"}'
+                    ),
+                ),
+            ],
+            [TextPart(text="summary of the exploration")],  # the compaction
+            [TextPart(text="All done")],
+            [TextPart(text="Hi")],  # the other soul
+        ]
+    )
+    runtime = runtime._replace(
+        llm=LLM(chat_provider=chat_provider, max_context_size=100_000, capabilities=set())
+    )
+    toolset = CustomToolset()
+    toolset += CompactContext()
+    agent = Agent(name="test", system_prompt="You are a test agent.", toolset=toolset)
+    context = Context(temp_work_dir / "history.jsonl")
+    await context.checkpoint(add_user_message=False)
+    await context.append_message(
+        [Message(role="user", content="Explore the repo"), Message(role="assistant", content="OK")]
+    )
+    soul = KimiSoul(agent, runtime, context=context)
+
+    await run_soul(soul, "Continue", _drain_wire, asyncio.Event())
+
+    assert len(chat_provider.histories) == 3
+    assert isinstance(context.history[0].content, list)
+    assert TextPart(text="summary of the exploration") in context.history[0].content
+    assert context.history[-1].content == [TextPart(text="All done")]
+
+    # the request is consumed and not shared with other souls on the same runtime
+    other_context = Context(temp_work_dir / "other.jsonl")
+    other_soul = KimiSoul(agent, runtime, context=other_context)
+    await run_soul(other_soul, "Hello", _drain_wire, asyncio.Event())
+
+    assert len(chat_provider.histories) == 4
+    assert chat_provider.histories[-1] == [Message(role="user", content="Hello")]
+    assert [message.content for message in other_context.history] == [
+        "Hello",
+        [TextPart(text="Hi")],
+    ]
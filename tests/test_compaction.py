@@ -0,0 +1,187 @@
+"""Tests for context compaction."""
+
+from pathlib import Path
+
+import pytest
+from kosong.base.message import Message, TextPart
+from kosong.chat_provider import MockChatProvider
+
+from kimi_cli.llm import LLM
+from kimi_cli.soul.agent import Agent
+from kimi_cli.soul.compaction import LinePruning, SimpleCompaction
+from kimi_cli.soul.context import Context
+from kimi_cli.soul.denwarenji import DenwaRenji
+from kimi_cli.soul.kimisoul import KimiSoul
+from kimi_cli.soul.message import is_checkpoint_message, system
+from kimi_cli.soul.runtime import Runtime
+from kimi_cli.soul.toolset import CustomToolset
+from kimi_cli.tools.dmail import SendDMail
+from kimi_cli.utils.message import message_estimate_tokens
+
+
+def test_line_pruning_prunes_old_tool_results_verbatim():
+    """Test that low-signal lines are removed from old tool results only."""
+    noisy_output = "\n".join(
+        [
+            "Collecting packages",
+            "",
+            "......",
+            " 42%|████      | 42/100",
+            '  File "main.py", line 1, in <module>',
+            '  File "main.py", line 1, in <module>',
+            "Error: src/main.py:12: boom",
+        ]
+    )
+    history = [
+        Message(role="user", content="Run the tests"),
+        Message(role="assistant", content="Running"),
+        Message(
+            role="tool",
+            content=[system("Command failed"), TextPart(text=noisy_output)],
+            tool_call_id="call_1",
+        ),
+        Message(role="assistant", content="Running again"),
+        Message(role="tool", content=[TextPart(text=noisy_output)], tool_call_id="call_2"),
+        Message(role="user", content="What happened?"),
+    ]
+
+    pruned = LinePruning().prune(history)
+
+    assert len(pruned) == len(history)
+    assert pruned[2].content == [
+        system("Command failed"),
+        TextPart(
+            text="Collecting packages\n"
+            '  File "main.py", line 1, in <module>\n'
+            "Error: src/main.py:12: boom"
+        ),
+    ]
+    assert pruned[2].tool_call_id == "call_1"
+    # the recent tool result and other messages are kept as is
+    for index in (0, 1, 3, 4, 5):
+        assert pruned[index] is history[index]
+
+
+def test_line_pruning_keeps_line_endings():
+    """Test that pruning keeps the line endings and leaves clean tool results untouched."""
+    clean_output = Message(
+        role="tool", content=[TextPart(text="line1\r\nline2\n")], tool_call_id="call_1"
+    )
+    noisy_output = Message(
+        role="tool", content=[TextPart(text="line1\r\n\r\nline2\n====\n")], tool_call_id="call_2"
+    )
+    history = [
+        Message(role="user", content="Run the tests"),
+        clean_output,
+        noisy_output,
+        Message(role="assistant", content="Done"),
+        Message(role="user", content="Thanks"),
+    ]
+
+    pruned = LinePruning().prune(history)
+
+    assert pruned[1] is clean_output
+    assert pruned[2].content == [TextPart(text="line1\r\nline2\n")]
+
+
+@pytest.mark.asyncio
+async def test_simple_compaction_keeps_previous_compaction_output():
+    """Test that previous compaction outputs are kept verbatim at the head of the history."""
+    llm = LLM(
+        chat_provider=MockChatProvider([TextPart(text="new summary")]),
+        max_context_size=100_000,
+        capabilities=set(),
+    )
+    previous_output = Message(
+        role="assistant",
+        content=[
+            system("Previous context has been compacted. Here is the compaction output:"),
+            TextPart(text="old summary"),
+        ],
+    )
+    history = [
+        Message(role="user", content=[system("CHECKPOINT 0")]),
+        previous_output,
+        Message(role="user", content="Fix the bug"),
+        Message(role="assistant", content="Fixed"),
+        Message(role="user", content="Thanks"),
+        Message(role="assistant", content="You're welcome"),
+    ]
+
+    compacted = await SimpleCompaction().compact(history, llm)
+
+    assert compacted[0] is previous_output
+    assert compacted[1].content == [
+        system("Previous context has been compacted. Here is the compaction output:"),
+        TextPart(text="new summary"),
+    ]
+    assert compacted[2:] == history[4:]
+
+
+@pytest.mark.asyncio
+async def test_prune_only_compaction_drops_stale_checkpoint_messages(
+    runtime: Runtime, denwa_renji: DenwaRenji, temp_work_dir: Path
+):
+    """Test that rewriting the context leaves only messages of the checkpoints that exist."""
+    toolset = CustomToolset()
+    toolset += SendDMail(denwa_renji)  # makes the soul add checkpoint messages
+    agent = Agent(name="test", system_prompt="", toolset=toolset)
+    context = Context(temp_work_dir / "history.jsonl")
+    soul = KimiSoul(agent, runtime, context=context)
+
+    await context.checkpoint(add_user_message=True)
+    await context.append_message(
+        [
+            Message(role="user", content="Run the tests"),
+            Message(role="assistant", content="Running"),
+            Message(role="tool", content=[TextPart(text="ok\n\n\n\n")], tool_call_id="call_1"),
+        ]
+    )
+    await context.checkpoint(add_user_message=True)
+    await context.append_message(
+        [Message(role="assistant", content="Done"), Message(role="user", content="Thanks")]
+    )
+
+    await soul.compact_context(budget=100_000)
+
+    assert context.n_checkpoints == 1
+    assert [message for message in context.history if is_checkpoint_message(message)] == [
+        Message(role="user", content=[system("CHECKPOINT 0")])
+    ]
+    assert context.history[3].content == [TextPart(text="ok\n")]  # pruned without the LLM
+
+
+@pytest.mark.asyncio
+async def test_pruning_just_below_budget_still_compacts_with_llm(
+    runtime: Runtime, temp_work_dir: Path
+):
+    """Test that pruning to just below the budget does not skip the LLM summarization."""
+    runtime = runtime._replace(
+        llm=LLM(
+            chat_provider=MockChatProvider([TextPart(text="summary")]),
+            max_context_size=100_000,
+            capabilities=set(),
+        )
+    )
+    agent = Agent(name="test", system_prompt="", toolset=CustomToolset())
+    context = Context(temp_work_dir / "history.jsonl")
+    soul = KimiSoul(agent, runtime, context=context)
+    history = [
+        Message(role="user", content="Run the tests"),
+        Message(role="assistant", content="Running"),
+        Message(role="tool", content=[TextPart(text="ok\n" + "." * 40)], tool_call_id="call_1"),
+        Message(role="assistant", content="Done"),
+        Message(role="user", content="Thanks"),
+    ]
+    await context.checkpoint(add_user_message=False)
+    await context.append_message(history)
+    n_pruned_tokens = sum(
+        message_estimate_tokens(original) - message_estimate_tokens(pruned)
+        for original, pruned in zip(history, LinePruning().prune(history), strict=True)
+    )
+    assert n_pruned_tokens > 0
+
+    await soul.compact_context(budget=context.estimated_token_count - n_pruned_tokens + 1)
+
+    assert isinstance(context.history[0].content, list)
+    assert TextPart(text="summary") in context.history[0].content
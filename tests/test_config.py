@@ -1,7 +1,10 @@
+import pytest
 from inline_snapshot import snapshot
+from pydantic import ValidationError
 
 from kimi_cli.config import (
     Config,
+    LoopControl,
     Services,
     get_default_config,
 )
@@ -29,9 +32,25 @@ def test_default_config_dump():
   "providers": {},
   "loop_control": {
     "max_steps_per_run": 100,
-    "max_retries_per_step": 3
+    "max_retries_per_step": 3,
+    "compaction_threshold": 0.9,
+    "max_tool_result_tokens": 8000,
+    "tool_result_truncation": {
+      "ReadFile": null
+    }
   },
   "services": {}
 }\
 """
     )
+
+
+def test_tool_result_truncation_merges_defaults():
+    loop_control = LoopControl.model_validate({"tool_result_truncation": {"Bash": 2000}})
+    assert loop_control.tool_result_truncation == {"ReadFile": None, "Bash": 2000}
+
+    loop_control = LoopControl.model_validate({"tool_result_truncation": {"ReadFile": 20000}})
+    assert loop_control.tool_result_truncation == {"ReadFile": 20000}
+
+    with pytest.raises(ValidationError):
+        LoopControl.model_validate({"tool_result_truncation": {"Bash": 0}})
@@ -0,0 +1,52 @@
+"""Tests for the context of the soul."""
+
+from pathlib import Path
+
+import pytest
+from kosong.base.message import Message
+
+from kimi_cli.soul.context import Context
+from kimi_cli.utils.message import message_estimate_tokens
+
+
+@pytest.fixture
+def context(temp_share_dir: Path) -> Context:
+    """Create a Context instance backed by a temporary file."""
+    return Context(file_backend=temp_share_dir / "history.jsonl")
+
+
+@pytest.mark.asyncio
+async def test_estimated_token_count_includes_pending_messages(context: Context):
+    """Test that messages appended after the last usage update are estimated."""
+    await context.append_message(Message(role="user", content="Hello"))
+    await context.update_token_count(100)
+    assert context.estimated_token_count == 100
+
+    tool_message = Message(role="tool", content="x" * 400, tool_call_id="call_1")
+    await context.append_message(tool_message)
+    assert context.token_count == 100
+    assert context.estimated_token_count == 100 + message_estimate_tokens(tool_message)
+
+    await context.update_token_count(300)
+    assert context.estimated_token_count == 300
+
+
+@pytest.mark.asyncio
+async def test_estimated_token_count_after_restore_and_revert(
+    context: Context, temp_share_dir: Path
+):
+    """Test that the estimation is rebuilt when the history is restored or reverted."""
+    await context.checkpoint(add_user_message=False)
+    await context.append_message(Message(role="user", content="Hello"))
+    await context.update_token_count(100)
+    await context.checkpoint(add_user_message=False)
+    tool_message = Message(role="tool", content="x" * 400, tool_call_id="call_1")
+    await context.append_message(tool_message)
+    expected = 100 + message_estimate_tokens(tool_message)
+
+    restored = Context(file_backend=temp_share_dir / "history.jsonl")
+    assert await restored.restore()
+    assert restored.estimated_token_count == expected
+
+    await restored.revert_to(1)
+    assert restored.estimated_token_count == 100
@@ -204,6 +204,30 @@ However, do not get stuck in a rut. Be flexible. Sometimes, you may try to use t
                     "type": "object",
                 },
             ),
+            Tool(
+                name="CompactContext",
+                description="""\
+Compact the current context. Before your next step, the whole context except the latest messages will be replaced with a summary of it, so that you can continue the task with a clean working memory.
+
+The context is automatically compacted when it is about to exceed the limit. Use this tool only when you are sure that most of the content in the context is no longer needed in detail. For example:
+
+- You explored several approaches or files, and got the conclusion. The exploration process itself is not relevant to the rest of the task.
+- You finished a subtask/milestone after many steps, and the next subtask does not depend on the details of the finished one.
+- You got very large tool outputs, and have already extracted what you need from them.
+
+DO NOT use this tool when the task is almost done, or when the context is still short. Before calling it, make sure that all the important information (e.g. file paths, decisions, unfinished todos) is mentioned in your recent messages or in the `reason`, so that it can be kept in the summary.
+""",
+                parameters={
+                    "properties": {
+                        "reason": {
+                            "description": "Why the context should be compacted now, and what has been concluded so far that must be kept.",
+                            "type": "string",
+                        }
+                    },
+                    "required": ["reason"],
+                    "type": "object",
+                },
+            ),
             Tool(
                 name="Bash",
                 description="""\
@@ -45,6 +45,9 @@ def test_load_tools_valid(runtime: Runtime):
 
     assert len(bad_tools) == 0
     assert toolset is not None
+    assert "Think" in toolset.tool_names
+    assert "Bash" in toolset.tool_names
+    assert "SendDMail" not in toolset.tool_names
 
 
 def test_load_tools_invalid(runtime: Runtime):
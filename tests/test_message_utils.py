@@ -2,7 +2,12 @@
 
 from kosong.base.message import ImageURLPart, Message, TextPart
 
-from kimi_cli.utils.message import message_extract_text, message_stringify
+from kimi_cli.utils.message import (
+    estimate_text_tokens,
+    message_estimate_tokens,
+    message_extract_text,
+    message_stringify,
+)
 
 
 def test_extract_text_from_string_content():
@@ -101,3 +106,19 @@ def test_extract_text_from_empty_string():
     result = message_extract_text(message)
 
     assert result == ""
+
+
+def test_estimate_tokens_text_and_non_text_parts():
+    """Test estimating tokens of a message with text and non-text parts."""
+    image_part = ImageURLPart(image_url=ImageURLPart.ImageURL(url="https://example.com/image.jpg"))
+    text_only = Message(role="user", content=[TextPart(text="a" * 400)])
+    with_image = Message(role="user", content=[TextPart(text="a" * 400), image_part])
+
+    assert estimate_text_tokens("a" * 400) == 100
+    assert message_estimate_tokens(text_only) > 100
+    assert message_estimate_tokens(with_image) > message_estimate_tokens(text_only)
+
+
+def test_estimate_tokens_non_ascii_text():
+    """Test that non-ASCII text is estimated as roughly one token per character."""
+    assert estimate_text_tokens("你好世界") == 4
@@ -57,6 +57,10 @@ def test_pyinstaller_datas():
                 "src/kimi_cli/tools/bash/bash.md",
                 "kimi_cli/tools/bash",
             ),
+            (
+                "src/kimi_cli/tools/compact/compact_context.md",
+                "kimi_cli/tools/compact",
+            ),
             (
                 "src/kimi_cli/tools/dmail/dmail.md",
                 "kimi_cli/tools/dmail",
@@ -116,6 +120,7 @@ def test_pyinstaller_hiddenimports():
         [
             "kimi_cli.tools",
             "kimi_cli.tools.bash",
+            "kimi_cli.tools.compact",
             "kimi_cli.tools.dmail",
             "kimi_cli.tools.file",
             "kimi_cli.tools.file.glob",
@@ -253,8 +253,7 @@ async def test_line_truncation_and_messaging(read_file_tool: ReadFile, temp_work
     )
 
 
-@pytest.mark.asyncio
-async def test_parameter_validation_line_offset(read_file_tool: ReadFile, sample_file: Path):
+def test_parameter_validation_line_offset(sample_file: Path):
     """Test that line_offset parameter validation works correctly."""
     # Test line_offset < 1 should be rejected by Pydantic validation
     with pytest.raises(ValueError, match="line_offset"):
@@ -264,8 +263,7 @@ async def test_parameter_validation_line_offset(read_file_tool: ReadFile, sample
         Params(path=str(sample_file), line_offset=-1)
 
 
-@pytest.mark.asyncio
-async def test_parameter_validation_n_lines(read_file_tool: ReadFile, sample_file: Path):
+def test_parameter_validation_n_lines(sample_file: Path):
     """Test that n_lines parameter validation works correctly."""
     # Test n_lines < 1 should be rejected by Pydantic validation
     with pytest.raises(ValueError, match="n_lines"):
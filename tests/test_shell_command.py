@@ -0,0 +1,19 @@
+"""Tests for running shell commands in the shell UI."""
+
+from kimi_cli.ui.shell import _split_simple_command
+
+
+def test_split_simple_command():
+    """Test that only commands without shell features are split into argv."""
+    assert _split_simple_command("ls -la") == ["ls", "-la"]
+    assert _split_simple_command("echo 'hello world'") == ["echo", "hello world"]
+
+
+def test_split_simple_command_falls_back_to_shell():
+    """Test that commands needing a shell are not split."""
+    assert _split_simple_command("ls | wc -l") is None
+    assert _split_simple_command("echo $HOME") is None
+    assert _split_simple_command("ls *.py") is None
+    assert _split_simple_command("FOO=1 env") is None
+    assert _split_simple_command("echo 'unterminated") is None
+    assert _split_simple_command("no-such-command-for-kimi-cli") is None
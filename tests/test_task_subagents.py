@@ -96,6 +96,7 @@ Test agents content
 """,
                 [
                     "Think",
+                    "CompactContext",
                     "Bash",
                     "ReadFile",
                     "Glob",
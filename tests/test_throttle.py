@@ -0,0 +1,57 @@
+"""Tests for the proactive rate limiter."""
+
+import time
+
+import pytest
+
+from kimi_cli.utils.throttle import RateLimiter
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_waits_for_token_bucket_refill():
+    """Test that requests beyond the token bucket wait for the refill."""
+    rate_limiter = RateLimiter(tokens_per_minute=6000)  # refilled at 100 tokens per second
+
+    start = time.monotonic()
+    await rate_limiter.acquire(6000)
+    assert time.monotonic() - start < 0.05
+
+    await rate_limiter.acquire(10)
+    assert time.monotonic() - start >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_oversized_request_does_not_block_forever():
+    """Test that a request larger than the token bucket is allowed when the bucket is full."""
+    rate_limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=100)
+
+    start = time.monotonic()
+    await rate_limiter.acquire(1_000_000)
+    assert time.monotonic() - start < 0.05
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_slows_down_when_rate_limited():
+    """Test that the refill rate is decreased on rate limit errors and recovered on success."""
+    rate_limiter = RateLimiter(requests_per_minute=60)
+    for _ in range(60):
+        await rate_limiter.acquire()
+
+    base_wait = rate_limiter._time_until_available(0)
+    rate_limiter.on_rate_limited()
+    assert rate_limiter._time_until_available(0) == pytest.approx(base_wait * 2, rel=0.1)
+
+    rate_limiter.on_success()
+    assert rate_limiter._time_until_available(0) < base_wait * 2
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_waits_after_rate_limited():
+    """Test that the next request waits for the slowed down refill after a rate limit error."""
+    rate_limiter = RateLimiter(requests_per_minute=600)  # refilled every 0.1 seconds
+    await rate_limiter.acquire()
+
+    rate_limiter.on_rate_limited()
+    start = time.monotonic()
+    await rate_limiter.acquire()
+    assert time.monotonic() - start >= 0.19
@@ -3,6 +3,7 @@
 from inline_snapshot import snapshot
 
 from kimi_cli.tools.bash import Bash
+from kimi_cli.tools.compact import CompactContext
 from kimi_cli.tools.dmail import SendDMail
 from kimi_cli.tools.file.glob import Glob
 from kimi_cli.tools.file.grep import Grep
@@ -74,6 +75,21 @@ Here are some typical scenarios you may want to send a DMail:
     )
 
 
+def test_compact_context_description(compact_context_tool: CompactContext):
+    """Test the description of CompactContext tool."""
+    assert compact_context_tool.base.description == snapshot("""\
+Compact the current context. Before your next step, the whole context except the latest messages will be replaced with a summary of it, so that you can continue the task with a clean working memory.
+
+The context is automatically compacted when it is about to exceed the limit. Use this tool only when you are sure that most of the content in the context is no longer needed in detail. For example:
+
+- You explored several approaches or files, and got the conclusion. The exploration process itself is not relevant to the rest of the task.
+- You finished a subtask/milestone after many steps, and the next subtask does not depend on the details of the finished one.
+- You got very large tool outputs, and have already extracted what you need from them.
+
+DO NOT use this tool when the task is almost done, or when the context is still short. Before calling it, make sure that all the important information (e.g. file paths, decisions, unfinished todos) is mentioned in your recent messages or in the `reason`, so that it can be kept in the summary.
+""")
+
+
 def test_think_description(think_tool: Think):
     """Test the description of Think tool."""
     assert think_tool.base.description == snapshot(
@@ -3,6 +3,7 @@
 from inline_snapshot import snapshot
 
 from kimi_cli.tools.bash import Bash
+from kimi_cli.tools.compact import CompactContext
 from kimi_cli.tools.dmail import SendDMail
 from kimi_cli.tools.file.glob import Glob
 from kimi_cli.tools.file.grep import Grep
@@ -59,6 +60,22 @@ def test_send_dmail_params_schema(send_dmail_tool: SendDMail):
     )
 
 
+def test_compact_context_params_schema(compact_context_tool: CompactContext):
+    """Test the schema of CompactContext tool parameters."""
+    assert compact_context_tool.base.parameters == snapshot(
+        {
+            "properties": {
+                "reason": {
+                    "description": "Why the context should be compacted now, and what has been concluded so far that must be kept.",
+                    "type": "string",
+                }
+            },
+            "required": ["reason"],
+            "type": "object",
+        }
+    )
+
+
 def test_think_params_schema(think_tool: Think):
     """Test the schema of Think tool parameters."""
     assert think_tool.base.parameters == snapshot(
@@ -0,0 +1,132 @@
+"""Tests for tool result truncation."""
+
+import json
+from pathlib import Path
+
+import pytest
+from kosong.base.message import Message, TextPart
+
+from kimi_cli.soul import kimisoul
+from kimi_cli.soul.agent import Agent
+from kimi_cli.soul.context import Context
+from kimi_cli.soul.kimisoul import KimiSoul
+from kimi_cli.soul.message import system
+from kimi_cli.soul.runtime import Runtime
+from kimi_cli.soul.toolset import CustomToolset
+from kimi_cli.soul.truncation import truncate_text, truncate_tool_message
+from kimi_cli.utils.message import estimate_text_tokens
+
+
+def test_truncate_text_keeps_short_text():
+    """Test that a text within the budget is returned as is."""
+    text = "line 1\nline 2"
+    assert truncate_text(text, 100) is text
+
+
+def test_truncate_text_collapses_json_arrays():
+    """Test that long JSON arrays are collapsed."""
+    text = json.dumps({"items": list(range(1000))})
+
+    truncated = truncate_text(text, 200)
+
+    assert json.loads(truncated) == {"items": [*range(20), "[...elided 980 items...]"]}
+
+
+def test_truncate_text_deeply_nested_json():
+    """Test that a JSON too deeply nested to collapse falls back to the line truncation."""
+    text = "[" * 3000 + "]" * 3000 + " " * 40_000
+
+    truncated = truncate_text(text, 100)
+
+    assert truncated.startswith("[" * 100)
+    assert estimate_text_tokens(truncated) <= 100
+
+
+def test_truncate_text_keeps_head_tail_and_errors():
+    """Test that the head, the tail and the error lines in the middle are kept."""
+    lines = [f"log line {i}" for i in range(1000)]
+    lines[500] = "ERROR: something went wrong"
+    text = "\n".join(lines)
+
+    truncated = truncate_text(text, 200)
+
+    assert estimate_text_tokens(truncated) <= 220
+    truncated_lines = truncated.splitlines()
+    assert truncated_lines[0] == "log line 0"
+    assert truncated_lines[-1] == "log line 999"
+    assert "ERROR: something went wrong" in truncated_lines
+    assert any("lines truncated" in line for line in truncated_lines)
+
+
+def test_truncate_text_single_long_line():
+    """Test that a single line longer than the budget keeps its beginning."""
+    truncated = truncate_text("x" * 400_000, 8000)
+
+    assert truncated.startswith("x" * 10_000)
+    assert truncated.endswith("...")
+    assert estimate_text_tokens(truncated) <= 8000
+
+
+def test_truncate_text_long_first_line():
+    """Test that a long first line does not cost the tail lines."""
+    lines = ["中" * 100_000, *(f"log line {i}" for i in range(2000))]
+
+    truncated = truncate_text("\n".join(lines), 8000)
+
+    assert estimate_text_tokens(truncated) <= 8000
+    truncated_lines = truncated.splitlines()
+    assert truncated_lines[0].startswith("中" * 1000)
+    assert truncated_lines[-1] == "log line 1999"
+    assert any("lines truncated" in line for line in truncated_lines)
+
+
+def test_truncate_tool_message_keeps_system_parts():
+    """Test that only the output parts of a tool message are truncated."""
+    message = Message(
+        role="tool",
+        content=[system("Command executed"), TextPart(text="\n".join(["x" * 40] * 1000))],
+        tool_call_id="call_1",
+    )
+
+    truncated = truncate_tool_message(message, 100)
+
+    assert isinstance(truncated.content, list)
+    assert truncated.content[0] == system("Command executed")
+    assert isinstance(truncated.content[1], TextPart)
+    assert estimate_text_tokens(truncated.content[1].text) < 150
+    assert truncated.tool_call_id == "call_1"
+    assert truncate_tool_message(message, 100_000) is message
+
+
+@pytest.mark.asyncio
+async def test_truncated_outputs_are_saved_next_to_context(runtime: Runtime, temp_work_dir: Path):
+    """Test that full outputs are saved per context without overwriting each other."""
+    agent = Agent(name="test", system_prompt="", toolset=CustomToolset())
+    context = Context(temp_work_dir / "subagent.jsonl")
+    soul = KimiSoul(agent, runtime, context=context)
+    outputs = ["\n".join([f"first {i}" for i in range(10_000)]), "second\n" * 10_000]
+
+    for output in outputs:
+        message = Message(role="tool", content=[TextPart(text=output)], tool_call_id="Bash:0")
+        truncated = await soul._truncate_tool_message(message, "Bash")
+        assert truncated is not message
+
+    saved_files = sorted((temp_work_dir / "subagent_tool_results").iterdir())
+    assert [file.read_text(encoding="utf-8") for file in saved_files] == outputs
+
+
+@pytest.mark.asyncio
+async def test_failed_truncation_keeps_tool_result(
+    runtime: Runtime, temp_work_dir: Path, monkeypatch: pytest.MonkeyPatch
+):
+    """Test that a failure in the truncation keeps the tool result as is."""
+
+    def fail_truncation(message: Message, max_tokens: int) -> Message:
+        raise RuntimeError("truncation failed")
+
+    monkeypatch.setattr(kimisoul, "truncate_tool_message", fail_truncation)
+    agent = Agent(name="test", system_prompt="", toolset=CustomToolset())
+    soul = KimiSoul(agent, runtime, context=Context(temp_work_dir / "history.jsonl"))
+    message = Message(role="tool", content=[TextPart(text="x" * 100_000)], tool_call_id="Bash:0")
+
+    assert await soul._truncate_tool_message(message, "Bash") is message